@@ -1,12 +1,23 @@
 import aws_cdk as cdk
 
+from .aspects import PermissionsBoundaryAspect
 from .grafana import GrafanaStack
 from .otel import OtelStack
-from .settings import Settings
+from .settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
-app = cdk.App()
+# Skip capturing a creation stack trace for every construct; it dominates synth time.
+# Tree metadata and analytics reporting are extra passes over the construct tree that
+# we don't use.
+app = cdk.App(
+    stack_traces=False,
+    tree_metadata=False,
+    analytics_reporting=False,
+)
+
+# Apply global permissions boundary
+cdk.Aspects.of(app).add(PermissionsBoundaryAspect(settings.permissions_boundary_arn))
 
 GrafanaStack(
     app,
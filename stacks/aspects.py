@@ -0,0 +1,25 @@
+import jsii
+from constructs import IConstruct
+from aws_cdk import CfnResource, IAspect, aws_iam as iam
+
+
+@jsii.implements(IAspect)
+class PermissionsBoundaryAspect:
+    """
+    Apply a permissions boundary to every IAM role and user in the app.
+
+    Equivalent to calling iam.PermissionsBoundary.of(stack).apply() in each stack,
+    without importing the boundary policy into every stack.
+    """
+
+    def __init__(self, permissions_boundary_arn: str) -> None:
+        self.permissions_boundary_arn = permissions_boundary_arn
+
+    def visit(self, node: IConstruct) -> None:
+        if isinstance(node, CfnResource) and node.cfn_resource_type in (
+            iam.CfnRole.CFN_RESOURCE_TYPE_NAME,
+            iam.CfnUser.CFN_RESOURCE_TYPE_NAME,
+        ):
+            node.add_property_override(
+                "PermissionsBoundary", self.permissions_boundary_arn
+            )
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, Optional, Sequence, Union
 
 from constructs import Construct
@@ -8,6 +9,7 @@ from aws_cdk import (
     aws_cloudfront as cloudfront,
     aws_cloudfront_origins as origins,
     aws_ec2 as ec2,
+    aws_ecr_assets as ecr_assets,
     aws_ecs as ecs,
     aws_ecs_patterns as ecs_patterns,
     aws_efs as efs,
@@ -17,11 +19,70 @@ from aws_cdk import (
 )
 
 from .settings import Settings, GrafanaRoles
+from .vpc import get_vpc
 
 
 EcsEnv = Dict[str, Union[str, ecs.Secret]]
 
+PUBLIC_SUBNETS = ec2.SubnetSelection(
+    one_per_az=True,
+    subnet_type=ec2.SubnetType.PUBLIC,
+)
+ISOLATED_SUBNETS = ec2.SubnetSelection(
+    one_per_az=True,
+    subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
+)
+
 
+# https://grafana.com/grafana/plugins/grafana-x-ray-datasource
+XRAY_READ_STATEMENT = {
+    "Sid": "xrayPermissions",
+    "Effect": "Allow",
+    "Action": [
+        "xray:BatchGetTraces",
+        "xray:GetTraceSummaries",
+        "xray:GetTraceGraph",
+        "xray:GetGroups",
+        "xray:GetTimeSeriesServiceStatistics",
+        "xray:GetInsightSummaries",
+        "xray:GetInsight",
+        "xray:GetServiceGraph",
+        "ec2:DescribeRegions",
+    ],
+    "Resource": "*",
+}
+
+# https://grafana.com/docs/grafana/latest/datasources/aws-cloudwatch/#configure-aws-authentication
+CLOUDWATCH_READ_STATEMENT = {
+    "Sid": "cloudwatchPermissions",
+    "Effect": "Allow",
+    "Action": [
+        # Allow reading metrics from cloud watch
+        "cloudwatch:DescribeAlarmsForMetric",
+        "cloudwatch:DescribeAlarmHistory",
+        "cloudwatch:DescribeAlarms",
+        "cloudwatch:ListMetrics",
+        "cloudwatch:GetMetricData",
+        "cloudwatch:GetInsightRuleReport",
+        # Allow reading logs from cloud watch
+        "logs:DescribeLogGroups",
+        "logs:GetLogGroupFields",
+        "logs:StartQuery",
+        "logs:StopQuery",
+        "logs:GetQueryResults",
+        "logs:GetLogEvents",
+        # Allow reading tags instances regions from ec2
+        "ec2:DescribeTags",
+        "ec2:DescribeInstances",
+        "ec2:DescribeRegions",
+        # Allow reading resources for tags
+        "tag:GetResources",
+    ],
+    "Resource": "*",
+}
+
+
+@lru_cache(maxsize=None)
 def envify(grafana_key: str) -> str:
     """
     Convert a Grafana config value to a Grafana-friendly environment variable.
@@ -40,13 +101,7 @@ class GrafanaStack(Stack):
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
-        # Apply global permissions boundary
-        boundary = iam.ManagedPolicy.from_managed_policy_arn(
-            self, "Boundary", settings.permissions_boundary_arn
-        )
-        iam.PermissionsBoundary.of(self).apply(boundary)
-
-        vpc = ec2.Vpc.from_lookup(self, "vpc", vpc_id=settings.vpc_id)
+        vpc = get_vpc(self, settings)
 
 
         container_name = "grafana"
@@ -67,6 +122,13 @@ class GrafanaStack(Stack):
             container_name=container_name,
             cluster_name=settings.grafana_stack_name,
             certificate=grafana_certificate,
+            image_cache_ref=settings.grafana_image_cache_ref,
+        )
+
+        self.grant_athena_access(
+            task_definition=service.task_definition,
+            workgroup=settings.athena_workgroup,
+            bucket_names=settings.athena_bucket_names,
         )
 
         container = service.task_definition.find_container(container_name)
@@ -120,6 +182,7 @@ class GrafanaStack(Stack):
         cluster_name: str,
         container_name: str,
         certificate: acm.Certificate = None,
+        image_cache_ref: Optional[str] = None,
     ):
         # Production has a public NAT Gateway subnet, which causes the
         # default load balancer creation to fail with too many subnets
@@ -130,10 +193,7 @@ class GrafanaStack(Stack):
             "load-balancer",
             vpc=vpc,
             internet_facing=True,
-            vpc_subnets=ec2.SubnetSelection(
-                one_per_az=True,
-                subnet_type=ec2.SubnetType.PUBLIC
-            ),
+            vpc_subnets=PUBLIC_SUBNETS,
         )
         service = ecs_patterns.ApplicationLoadBalancedFargateService(
             self,
@@ -145,14 +205,36 @@ class GrafanaStack(Stack):
                 vpc=vpc,
             ),
             load_balancer=load_balancer,
-            task_subnets=ec2.SubnetSelection(
-                one_per_az=True,
-                subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
-            ),
+            task_subnets=ISOLATED_SUBNETS,
             service_name="grafana",
             desired_count=1,
             task_image_options=ecs_patterns.ApplicationLoadBalancedTaskImageOptions(
-                image=ecs.ContainerImage.from_asset("grafana"),
+                image=ecs.ContainerImage.from_asset(
+                    "grafana",
+                    # Keep docs out of the asset hash so editing them doesn't trigger a rebuild
+                    exclude=["*.md"],
+                    platform=ecr_assets.Platform.LINUX_ARM64,
+                    # Reuse layers from a BuildKit registry cache to avoid rebuilding
+                    # (under emulation on non-ARM hosts) on every deployment. See the
+                    # README for the Docker setup this requires.
+                    cache_from=(
+                        [
+                            ecr_assets.DockerCacheOption(
+                                type="registry", params={"ref": image_cache_ref}
+                            )
+                        ]
+                        if image_cache_ref
+                        else None
+                    ),
+                    cache_to=(
+                        ecr_assets.DockerCacheOption(
+                            type="registry",
+                            params={"ref": image_cache_ref, "mode": "max"},
+                        )
+                        if image_cache_ref
+                        else None
+                    ),
+                ),
                 container_name=container_name,
                 container_port=3000,
             ),
@@ -186,57 +268,102 @@ class GrafanaStack(Stack):
         )
 
         # Ensure service can interact with other AWS resources
+        for statement in (XRAY_READ_STATEMENT, CLOUDWATCH_READ_STATEMENT):
+            service.task_definition.add_to_task_role_policy(
+                iam.PolicyStatement.from_json(statement)
+            )
+
+        return service
+
+    def grant_athena_access(
+        self,
+        task_definition: ecs.TaskDefinition,
+        workgroup: str,
+        bucket_names: Optional[Sequence[str]] = None,
+    ):
+        """
+        Allow the Athena data source to run queries in the given workgroup, read the
+        Glue catalog and read/write the data and query result buckets.
+        https://grafana.com/grafana/plugins/grafana-athena-datasource
+        """
+        bucket_arns = ["*"]
+        if bucket_names:
+            bucket_arns = []
+            for name in bucket_names:
+                bucket_arn = f"arn:{self.partition}:s3:::{name}"
+                bucket_arns.extend([bucket_arn, f"{bucket_arn}/*"])
+
         for policy in (
             iam.PolicyStatement(
-                # https://grafana.com/grafana/plugins/grafana-x-ray-datasource
-                sid="xrayPermissions",
+                sid="athenaPermissions",
                 actions=[
-                    "xray:BatchGetTraces",
-                    "xray:GetTraceSummaries",
-                    "xray:GetTraceGraph",
-                    "xray:GetGroups",
-                    "xray:GetTimeSeriesServiceStatistics",
-                    "xray:GetInsightSummaries",
-                    "xray:GetInsight",
-                    "xray:GetServiceGraph",
-                    "ec2:DescribeRegions",
+                    "athena:GetDatabase",
+                    "athena:GetDataCatalog",
+                    "athena:GetTableMetadata",
+                    "athena:ListDatabases",
+                    "athena:ListTableMetadata",
+                    "athena:GetWorkGroup",
+                    "athena:StartQueryExecution",
+                    "athena:StopQueryExecution",
+                    "athena:GetQueryExecution",
+                    "athena:GetQueryResults",
+                ],
+                resources=[
+                    self.format_arn(
+                        service="athena", resource="workgroup", resource_name=workgroup
+                    ),
+                    self.format_arn(
+                        service="athena", resource="datacatalog", resource_name="*"
+                    ),
                 ],
-                resources=["*"],
             ),
             iam.PolicyStatement(
-                # https://grafana.com/docs/grafana/latest/datasources/aws-cloudwatch/#configure-aws-authentication
-                sid="cloudwatchPermissions",
+                # These actions don't support resource-level permissions
+                sid="athenaListPermissions",
                 actions=[
-                    # Allow reading metrics from cloud watch
-                    "cloudwatch:DescribeAlarmsForMetric",
-                    "cloudwatch:DescribeAlarmHistory",
-                    "cloudwatch:DescribeAlarms",
-                    "cloudwatch:ListMetrics",
-                    "cloudwatch:GetMetricData",
-                    "cloudwatch:GetInsightRuleReport",
-                    # Allow reading logs from cloud watch
-                    "logs:DescribeLogGroups",
-                    "logs:GetLogGroupFields",
-                    "logs:StartQuery",
-                    "logs:StopQuery",
-                    "logs:GetQueryResults",
-                    "logs:GetLogEvents",
-                    # Allow reading tags instances regions from ec2
-                    "ec2:DescribeTags",
-                    "ec2:DescribeInstances",
-                    "ec2:DescribeRegions",
-                    # Allow reading resources for tags
-                    "tag:GetResources",
-                    "athena:*",
-                    "glue:*",
-                    "s3:*"
+                    "athena:ListDataCatalogs",
+                    "athena:ListWorkGroups",
                 ],
                 resources=["*"],
             ),
+            iam.PolicyStatement(
+                sid="gluePermissions",
+                actions=[
+                    "glue:GetDatabase",
+                    "glue:GetDatabases",
+                    "glue:GetTable",
+                    "glue:GetTables",
+                    "glue:GetPartition",
+                    "glue:GetPartitions",
+                    "glue:BatchGetPartition",
+                ],
+                resources=[
+                    self.format_arn(service="glue", resource="catalog"),
+                    self.format_arn(
+                        service="glue", resource="database", resource_name="*"
+                    ),
+                    self.format_arn(
+                        service="glue", resource="table", resource_name="*/*"
+                    ),
+                ],
+            ),
+            iam.PolicyStatement(
+                sid="s3Permissions",
+                actions=[
+                    # Allow reading source data and query results
+                    "s3:GetBucketLocation",
+                    "s3:GetObject",
+                    "s3:ListBucket",
+                    # Allow writing query results
+                    "s3:PutObject",
+                    "s3:ListBucketMultipartUploads",
+                    "s3:ListMultipartUploadParts",
+                    "s3:AbortMultipartUpload",
+                ],
+                resources=bucket_arns,
+            ),
         ):
-            service.task_definition.add_to_task_role_policy(policy)
-
-        return service
+            task_definition.add_to_task_role_policy(policy)
 
     def add_efs_mount(
         self,
@@ -301,6 +428,10 @@ class GrafanaStack(Stack):
 
         file_system.connections.allow_default_port_from(service.connections)
 
+        # The task definition only references the file system and access point, so
+        # wait for the mount targets explicitly before starting tasks that mount them
+        service.node.add_dependency(file_system.mount_targets_available)
+
         return mount_point
 
     def create_cloudfront_distribution(
@@ -344,20 +475,18 @@ class GrafanaStack(Stack):
             "oauth-secret-gh",
             oauth_secret_name,
         )
-        role_attr_path = (
+        role_attr_parts = [
             # Admin Group
             f"contains(groups[*], {admin_group!r}) && {GrafanaRoles.grafana_admin.value!r} "
-            +
+        ]
+        if editor_group:
             # Editor Group
-            (
+            role_attr_parts.append(
                 f"|| contains(groups[*], {editor_group!r}) && {GrafanaRoles.editor.value!r} "
-                if editor_group
-                else ""
             )
-            +
-            # Default Role
-            f"|| {default_role.value!r}"
-        )
+        # Default Role
+        role_attr_parts.append(f"|| {default_role.value!r}")
+        role_attr_path = "".join(role_attr_parts)
         github_settings: EcsEnv = {
             # Customized
             "allowed_organizations": ",".join(allowed_orgs),
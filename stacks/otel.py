@@ -1,4 +1,7 @@
 import hashlib
+import re
+from pathlib import Path
+
 from constructs import Construct
 from aws_cdk import (
     Duration,
@@ -11,6 +14,41 @@ from aws_cdk import (
 )
 
 from .settings import Settings
+from .vpc import get_vpc
+
+
+# Placeholders in otel/otel-config.yaml, filled from settings at synth time
+OTEL_CONFIG_PLACEHOLDER = re.compile(rb"##(HONEYCOMB_API_KEY|TRACE_EXPORTERS)##")
+
+# https://grafana.com/grafana/plugins/grafana-x-ray-datasource
+XRAY_WRITE_STATEMENT = {
+    "Sid": "xrayPermissions",
+    "Effect": "Allow",
+    "Action": [
+        "xray:PutTraceSegments",
+        "xray:PutTelemetryRecords",
+        "xray:GetSamplingRules",
+        "xray:GetSamplingTargets",
+        "xray:GetSamplingStatisticSummaries",
+        "ssm:GetParameters",
+    ],
+    "Resource": "*",
+}
+
+# https://grafana.com/docs/grafana/latest/datasources/aws-cloudwatch/#configure-aws-authentication
+CLOUDWATCH_WRITE_STATEMENT = {
+    "Sid": "cloudwatchPermissions",
+    "Effect": "Allow",
+    "Action": [
+        # Allow writing logs to cloud watch
+        "logs:PutLogEvents",
+        "logs:CreateLogGroup",
+        "logs:CreateLogStream",
+        "logs:DescribeLogStreams",
+        "logs:DescribeLogGroups",
+    ],
+    "Resource": "*",
+}
 
 
 class OtelStack(Stack):
@@ -27,28 +65,29 @@ class OtelStack(Stack):
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
-        boundary = iam.ManagedPolicy.from_managed_policy_arn(
-            self, "Boundary", settings.permissions_boundary_arn
-        )
-        iam.PermissionsBoundary.of(self).apply(boundary)
-
-        vpc = ec2.Vpc.from_lookup(self, "vpc", vpc_id=settings.vpc_id)
+        vpc = get_vpc(self, settings)
 
         otel_config_name = settings.stack_name("OTELConfig")
 
-        with open("./otel/otel-config.yaml", "r") as otel_file:
-            otel_config_raw_content = otel_file.read()
-            otel_config_content = otel_config_raw_content.replace(
-                "##HONEYCOMB_API_KEY##", settings.honeycomb_api_key
-            ).replace("##TRACE_EXPORTERS##", settings.trace_exporters)
-            otel_config_hash = hashlib.sha256(otel_config_content.encode()).hexdigest()
+        otel_config_values = {
+            b"HONEYCOMB_API_KEY": settings.honeycomb_api_key.encode(),
+            b"TRACE_EXPORTERS": settings.trace_exporters.encode(),
+        }
+        otel_config_bytes = OTEL_CONFIG_PLACEHOLDER.sub(
+            lambda match: otel_config_values[match.group(1)],
+            Path("./otel/otel-config.yaml").read_bytes(),
+        )
+        otel_config_hash = hashlib.sha256(otel_config_bytes).hexdigest()
+        otel_config_content = otel_config_bytes.decode()
 
         self.otel_config = ssm.StringParameter(
             self,
             "OtelConfig",
             string_value=otel_config_content,
             parameter_name=otel_config_name,
-            tier=ssm.ParameterTier.ADVANCED,
+            # Let SSM use a standard parameter when the config fits, without ever
+            # attempting to downgrade an existing advanced parameter
+            tier=ssm.ParameterTier.INTELLIGENT_TIERING,
         )
 
         otel_env_vars = {
@@ -81,6 +120,7 @@ class OtelStack(Stack):
             vpc=vpc,
             cluster_name=settings.stack_name("otel"),
         )
+        region = self.region
 
         image = ecs.ContainerImage.from_registry("amazon/aws-otel-collector:latest")
         task_definition: ecs.FargateTaskDefinition = ecs.FargateTaskDefinition(
@@ -93,7 +133,7 @@ class OtelStack(Stack):
             "container",
             image=image,
             environment={
-                "AWS_REGION": Stack.of(self).region,
+                "AWS_REGION": region,
                 # Store config hash in order to force new version and
                 # new deployment when the config is updated
                 "OTEL_CONFIG_HASH": otel_config_hash,
@@ -142,33 +182,7 @@ class OtelStack(Stack):
         """
         Ensure service is able to interact with other AWS services required for monitoring.
         """
-        task_definition.add_to_task_role_policy(
-            iam.PolicyStatement(
-                # https://grafana.com/grafana/plugins/grafana-x-ray-datasource
-                sid="xrayPermissions",
-                actions=[
-                    "xray:PutTraceSegments",
-                    "xray:PutTelemetryRecords",
-                    "xray:GetSamplingRules",
-                    "xray:GetSamplingTargets",
-                    "xray:GetSamplingStatisticSummaries",
-                    "ssm:GetParameters",
-                ],
-                resources=["*"],
-            )
-        )
-        task_definition.add_to_task_role_policy(
-            iam.PolicyStatement(
-                # https://grafana.com/docs/grafana/latest/datasources/aws-cloudwatch/#configure-aws-authentication
-                sid="cloudwatchPermissions",
-                actions=[
-                    # Allow writing logs to cloud watch
-                    "logs:PutLogEvents",
-                    "logs:CreateLogGroup",
-                    "logs:CreateLogStream",
-                    "logs:DescribeLogStreams",
-                    "logs:DescribeLogGroups",
-                ],
-                resources=["*"],
+        for statement in (XRAY_WRITE_STATEMENT, CLOUDWATCH_WRITE_STATEMENT):
+            task_definition.add_to_task_role_policy(
+                iam.PolicyStatement.from_json(statement)
             )
-        )
@@ -1,10 +1,11 @@
 from enum import Enum
+from functools import lru_cache
 import os
 from typing import List, Optional
 from getpass import getuser
 
 import aws_cdk
-from pydantic import Field, validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,6 +29,27 @@ class Settings(BaseSettings):
 
     vpc_id: str
 
+    # Optional static VPC attributes, avoids a VPC lookup during synth when provided
+    availability_zones: Optional[List[str]] = Field(
+        None,
+        description=(
+            "List of comma-separated availability zones of the VPC. When set, the VPC "
+            "is imported from the subnet IDs below rather than looked up."
+        ),
+    )
+    public_subnet_ids: Optional[List[str]] = Field(
+        None,
+        description="List of comma-separated public subnet IDs, one per availability zone",
+    )
+    private_subnet_ids: Optional[List[str]] = Field(
+        None,
+        description="List of comma-separated private subnet IDs, one per availability zone",
+    )
+    isolated_subnet_ids: Optional[List[str]] = Field(
+        None,
+        description="List of comma-separated isolated subnet IDs, one per availability zone",
+    )
+
     project: Optional[str] = "GHGC"
     grafana_domain_name: Optional[str] = None
 
@@ -36,6 +58,17 @@ class Settings(BaseSettings):
     cloudfront_certificate_arn: Optional[str] = None
 
 
+    grafana_image_cache_ref: Optional[str] = Field(
+        None,
+        description=(
+            "Registry reference used as a BuildKit cache for the Grafana image, e.g. a "
+            "tag in the CDK bootstrap container assets repository so the asset "
+            "publishing credentials can read and write it. Requires Docker's containerd "
+            "image store, see README. If unset, the image is built without a remote "
+            "cache."
+        ),
+    )
+
     permissions_boundary_arn: str
 
     # Github auth provider configuration
@@ -102,6 +135,18 @@ class Settings(BaseSettings):
         default="GHGC.internal",
     )
 
+    athena_workgroup: str = Field(
+        description="Athena workgroup that Grafana is allowed to run queries in",
+        default="primary",
+    )
+    athena_bucket_names: Optional[List[str]] = Field(
+        None,
+        description=(
+            "List of comma-separated S3 buckets holding Athena source data and query "
+            "results. If unset, Grafana may read and write objects in all buckets."
+        ),
+    )
+
     honeycomb_api_key: str
 
     trace_exporters: str = Field(
@@ -135,9 +180,26 @@ class Settings(BaseSettings):
             region=self.cdk_deploy_region,
         )
 
-    @validator("github_allowed_orgs", pre=True)
+    @field_validator(
+        "github_allowed_orgs",
+        "availability_zones",
+        "public_subnet_ids",
+        "private_subnet_ids",
+        "isolated_subnet_ids",
+        "athena_bucket_names",
+        mode="before",
+    )
+    @classmethod
     def split_comma_separated(cls, v: object) -> object:
         if isinstance(v, str):
             v = v.strip()
             return [] if v == "" else v.split(",")
         return v
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once per process, avoiding repeated dotenv parsing and validation.
+    """
+    return Settings()
@@ -0,0 +1,26 @@
+from constructs import Construct
+from aws_cdk import aws_ec2 as ec2
+
+from .settings import Settings
+
+
+def get_vpc(scope: Construct, settings: Settings) -> ec2.IVpc:
+    """
+    Import the VPC shared by all stacks.
+
+    When the VPC's availability zones and subnets are configured, the VPC is built
+    from those attributes directly. Otherwise it is looked up; every stack resolves
+    the VPC through here so that lookups use identical arguments and therefore share
+    a single cached entry in cdk.context.json.
+    """
+    if settings.availability_zones:
+        return ec2.Vpc.from_vpc_attributes(
+            scope,
+            "vpc",
+            vpc_id=settings.vpc_id,
+            availability_zones=settings.availability_zones,
+            public_subnet_ids=settings.public_subnet_ids,
+            private_subnet_ids=settings.private_subnet_ids,
+            isolated_subnet_ids=settings.isolated_subnet_ids,
+        )
+    return ec2.Vpc.from_lookup(scope, "vpc", vpc_id=settings.vpc_id)